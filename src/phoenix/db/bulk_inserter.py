@@ -18,6 +18,7 @@ from typing import (
     cast,
 )
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypeAlias
 
 import phoenix.trace.v1 as pb
@@ -28,7 +29,7 @@ from phoenix.db.insertion.evaluation import (
     insert_evaluation,
 )
 from phoenix.db.insertion.helpers import DataManipulation, DataManipulationEvent
-from phoenix.db.insertion.span import SpanInsertionEvent, insert_span
+from phoenix.db.insertion.span import SpanInsertionEvent, insert_span, insert_spans
 from phoenix.db.insertion.span_annotation import SpanAnnotationQueueInserter
 from phoenix.db.insertion.trace_annotation import TraceAnnotationQueueInserter
 from phoenix.db.insertion.types import Insertables, Precursors
@@ -184,30 +185,25 @@ class BulkInserter:
             await asyncio.sleep(self._sleep)
 
     async def _insert_spans(self, spans: List[Tuple[Span, str]]) -> None:
-        project_ids = set()
+        project_ids: Set[ProjectRowId] = set()
         for i in range(0, len(spans), self._max_ops_per_transaction):
             try:
                 start = perf_counter()
-                async with self._db() as session:
-                    for span, project_name in islice(spans, i, i + self._max_ops_per_transaction):
-                        if self._enable_prometheus:
-                            from phoenix.server.prometheus import BULK_LOADER_SPAN_INSERTIONS
-
-                            BULK_LOADER_SPAN_INSERTIONS.inc()
-                        result: Optional[SpanInsertionEvent] = None
-                        try:
-                            async with session.begin_nested():
-                                result = await insert_span(session, span, project_name)
-                        except Exception:
-                            if self._enable_prometheus:
-                                from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
+                batch = spans[i : i + self._max_ops_per_transaction]
+                if self._enable_prometheus:
+                    from phoenix.server.prometheus import BULK_LOADER_SPAN_INSERTIONS
 
-                                BULK_LOADER_EXCEPTIONS.inc()
-                            logger.exception(
-                                f"Failed to insert span with span_id={span.context.span_id}"
-                            )
-                        if result is not None:
-                            project_ids.add(result.project_rowid)
+                    BULK_LOADER_SPAN_INSERTIONS.inc(len(batch))
+                async with self._db() as session:
+                    try:
+                        async with session.begin_nested():
+                            results = await insert_spans(session, batch)
+                    except Exception:
+                        # Fall back to one span at a time so that a bad span
+                        # does not prevent the rest of the batch from being inserted.
+                        logger.warning("Failed to insert spans in bulk", exc_info=True)
+                        results = await self._insert_spans_one_at_a_time(session, batch)
+                    project_ids.update(result.project_rowid for result in results)
                 if self._enable_prometheus:
                     from phoenix.server.prometheus import BULK_LOADER_INSERTION_TIME
 
@@ -220,6 +216,27 @@ class BulkInserter:
                 logger.exception("Failed to insert spans")
         self._event_queue.put(SpanInsertEvent(tuple(project_ids)))
 
+    async def _insert_spans_one_at_a_time(
+        self,
+        session: AsyncSession,
+        spans: List[Tuple[Span, str]],
+    ) -> List[SpanInsertionEvent]:
+        results = []
+        for span, project_name in spans:
+            try:
+                async with session.begin_nested():
+                    result = await insert_span(session, span, project_name)
+            except Exception:
+                if self._enable_prometheus:
+                    from phoenix.server.prometheus import BULK_LOADER_EXCEPTIONS
+
+                    BULK_LOADER_EXCEPTIONS.inc()
+                logger.exception(f"Failed to insert span with span_id={span.context.span_id}")
+                continue
+            if result is not None:
+                results.append(result)
+        return results
+
     async def _insert_evaluations(self, evaluations: List[pb.Evaluation]) -> None:
         for i in range(0, len(evaluations), self._max_ops_per_transaction):
             try:
@@ -1,8 +1,21 @@
-from dataclasses import asdict
-from typing import NamedTuple, Optional, cast
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from openinference.semconv.trace import SpanAttributes
-from sqlalchemy import func, insert, select, update
+from sqlalchemy import (
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    table,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as insert_postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from phoenix.db import models
@@ -11,6 +24,16 @@ from phoenix.db.insertion.helpers import OnConflict, insert_on_conflict
 from phoenix.trace.attributes import get_attribute_value
 from phoenix.trace.schemas import Span, SpanStatusCode
 
+# The token counts share a prefix, so the nested attributes are walked only
+# once to reach both of them.
+_LLM_TOKEN_COUNT, _, _PROMPT = SpanAttributes.LLM_TOKEN_COUNT_PROMPT.rpartition(".")
+_, _, _COMPLETION = SpanAttributes.LLM_TOKEN_COUNT_COMPLETION.rpartition(".")
+
+# PostgreSQL inserts of at least this many spans go through COPY. For smaller
+# batches, the extra round trips of staging outweigh the faster transfer.
+_COPY_THRESHOLD = 256
+_STAGE = "spans_stage"
+
 
 class SpanInsertionEvent(NamedTuple):
     project_rowid: int
@@ -25,123 +48,296 @@ async def insert_span(
     span: Span,
     project_name: str,
 ) -> Optional[SpanInsertionEvent]:
+    events = await insert_spans(session, [(span, project_name)])
+    return events[0] if events else None
+
+
+async def insert_spans(
+    session: AsyncSession,
+    spans: Sequence[Tuple[Span, str]],
+) -> List[SpanInsertionEvent]:
+    """
+    Inserts a batch of spans using a fixed number of multi-row statements,
+    leaving the database in the same state as inserting the spans one at a
+    time in order. Returns one event per span that was actually inserted.
+    """
+    if not spans:
+        return []
     dialect = SupportedSQLDialect(session.bind.dialect.name)
-    if (
-        project_rowid := await session.scalar(
-            select(models.Project.id).where(models.Project.name == project_name)
+    project_names = {project_name for _, project_name in spans}
+    project_rowids: Dict[str, int] = dict(
+        (
+            await session.execute(
+                select(models.Project.name, models.Project.id).where(
+                    models.Project.name.in_(project_names)
+                )
+            )
         )
-    ) is None:
-        project_rowid = await session.scalar(
-            insert(models.Project).values(dict(name=project_name)).returning(models.Project.id)
+        .tuples()
+        .all()
+    )
+    if missing_project_names := project_names - project_rowids.keys():
+        await session.execute(
+            insert_on_conflict(
+                *(dict(name=name) for name in missing_project_names),
+                dialect=dialect,
+                table=models.Project,
+                unique_by=("name",),
+                on_conflict=OnConflict.DO_NOTHING,
+            )
         )
-    assert project_rowid is not None
-    if trace := await session.scalar(
-        select(models.Trace).where(models.Trace.trace_id == span.context.trace_id)
+        project_rowids.update(
+            (
+                await session.execute(
+                    select(models.Project.name, models.Project.id).where(
+                        models.Project.name.in_(missing_project_names)
+                    )
+                )
+            )
+            .tuples()
+            .all()
+        )
+    # A trace belongs to the project of the first of its spans to arrive, and
+    # its time range covers all of its spans, duplicates included.
+    trace_bounds: Dict[str, Tuple[datetime, datetime, str]] = {}
+    for span, project_name in spans:
+        if bounds := trace_bounds.get(trace_id := span.context.trace_id):
+            trace_bounds[trace_id] = (
+                min(bounds[0], span.start_time),
+                max(bounds[1], span.end_time),
+                bounds[2],
+            )
+        else:
+            trace_bounds[trace_id] = (span.start_time, span.end_time, project_name)
+    trace_rowids: Dict[str, int] = {}
+    extended_time_ranges: Dict[int, Tuple[datetime, datetime]] = {}
+    for trace_rowid, trace_id, trace_start_time, trace_end_time in await session.execute(
+        select(
+            models.Trace.id,
+            models.Trace.trace_id,
+            models.Trace.start_time,
+            models.Trace.end_time,
+        ).where(models.Trace.trace_id.in_(trace_bounds))
     ):
-        trace_rowid = trace.id
-        if span.start_time < trace.start_time or trace.end_time < span.end_time:
-            trace_start_time = min(trace.start_time, span.start_time)
-            trace_end_time = max(trace.end_time, span.end_time)
-            await session.execute(
-                update(models.Trace)
-                .where(models.Trace.id == trace_rowid)
-                .values(
-                    start_time=trace_start_time,
-                    end_time=trace_end_time,
+        trace_rowids[trace_id] = trace_rowid
+        start_time, end_time, _ = trace_bounds[trace_id]
+        if start_time < trace_start_time or trace_end_time < end_time:
+            extended_time_ranges[trace_rowid] = (
+                min(trace_start_time, start_time),
+                max(trace_end_time, end_time),
+            )
+    if extended_time_ranges:
+        # Extend the time ranges of all the affected traces in one statement.
+        await session.execute(
+            update(models.Trace)
+            .where(models.Trace.id.in_(extended_time_ranges))
+            .values(
+                start_time=case(
+                    {
+                        trace_rowid: literal(start_time, models.Trace.start_time.type)
+                        for trace_rowid, (start_time, _) in extended_time_ranges.items()
+                    },
+                    value=models.Trace.id,
+                ),
+                end_time=case(
+                    {
+                        trace_rowid: literal(end_time, models.Trace.end_time.type)
+                        for trace_rowid, (_, end_time) in extended_time_ranges.items()
+                    },
+                    value=models.Trace.id,
+                ),
+            )
+        )
+    if new_trace_ids := trace_bounds.keys() - trace_rowids.keys():
+        trace_rowids.update(
+            (
+                await session.execute(
+                    insert(models.Trace)
+                    .values(
+                        [
+                            dict(
+                                project_rowid=project_rowids[project_name],
+                                trace_id=trace_id,
+                                start_time=start_time,
+                                end_time=end_time,
+                            )
+                            for trace_id, (start_time, end_time, project_name) in (
+                                trace_bounds.items()
+                            )
+                            if trace_id in new_trace_ids
+                        ]
+                    )
+                    .returning(models.Trace.trace_id, models.Trace.id)
                 )
             )
+            .tuples()
+            .all()
+        )
+    # Only the first occurrence of a span is inserted, as would happen if the
+    # spans were inserted one at a time.
+    unique_spans: Dict[str, Tuple[Span, str]] = {}
+    for span, project_name in spans:
+        unique_spans.setdefault(span.context.span_id, (span, project_name))
+    # Spans are inserted with only their own values. Their cumulative values
+    # are filled in below, along with those of their ancestors.
+    records = [
+        _span_record(span, trace_rowids[span.context.trace_id]) for span, _ in unique_spans.values()
+    ]
+    if dialect is SupportedSQLDialect.POSTGRESQL and len(records) >= _COPY_THRESHOLD:
+        span_rowids = await _copy_spans(session, records)
     else:
-        trace_rowid = cast(
-            int,
-            await session.scalar(
-                insert(models.Trace)
-                .values(
-                    project_rowid=project_rowid,
-                    trace_id=span.context.trace_id,
-                    start_time=span.start_time,
-                    end_time=span.end_time,
+        span_rowids = dict(
+            (
+                await session.execute(
+                    insert_on_conflict(
+                        *records,
+                        dialect=dialect,
+                        table=models.Span,
+                        unique_by=("span_id",),
+                        on_conflict=OnConflict.DO_NOTHING,
+                    ).returning(models.Span.span_id, models.Span.id)
                 )
-                .returning(models.Trace.id)
-            ),
-        )
-    cumulative_error_count = int(span.status_code is SpanStatusCode.ERROR)
-    cumulative_llm_token_count_prompt = cast(
-        int, get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT) or 0
-    )
-    cumulative_llm_token_count_completion = cast(
-        int, get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION) or 0
-    )
-    llm_token_count_prompt = cast(
-        Optional[int], get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_PROMPT)
-    )
-    llm_token_count_completion = cast(
-        Optional[int],
-        get_attribute_value(span.attributes, SpanAttributes.LLM_TOKEN_COUNT_COMPLETION),
-    )
-    if accumulation := (
-        await session.execute(
-            select(
-                func.sum(models.Span.cumulative_error_count),
-                func.sum(models.Span.cumulative_llm_token_count_prompt),
-                func.sum(models.Span.cumulative_llm_token_count_completion),
-            ).where(models.Span.parent_id == span.context.span_id)
+            )
+            .tuples()
+            .all()
         )
-    ).first():
-        cumulative_error_count += cast(int, accumulation[0] or 0)
-        cumulative_llm_token_count_prompt += cast(int, accumulation[1] or 0)
-        cumulative_llm_token_count_completion += cast(int, accumulation[2] or 0)
-    span_rowid = await session.scalar(
-        insert_on_conflict(
-            dict(
-                span_id=span.context.span_id,
-                trace_rowid=trace_rowid,
-                parent_id=span.parent_id,
-                span_kind=span.span_kind.value,
-                name=span.name,
-                start_time=span.start_time,
-                end_time=span.end_time,
-                attributes=span.attributes,
-                events=[asdict(event) for event in span.events],
-                status_code=span.status_code.value,
-                status_message=span.status_message,
-                cumulative_error_count=cumulative_error_count,
-                cumulative_llm_token_count_prompt=cumulative_llm_token_count_prompt,
-                cumulative_llm_token_count_completion=cumulative_llm_token_count_completion,
-                llm_token_count_prompt=llm_token_count_prompt,
-                llm_token_count_completion=llm_token_count_completion,
-            ),
-            dialect=dialect,
-            table=models.Span,
-            unique_by=("span_id",),
-            on_conflict=OnConflict.DO_NOTHING,
-        ).returning(models.Span.id)
-    )
-    if span_rowid is None:
-        return None
-    # Propagate cumulative values to ancestors. This is usually a no-op, since
-    # the parent usually arrives after the child. But in the event that a
-    # child arrives after its parent, we need to make sure that all the
-    # ancestors' cumulative values are updated.
+    if not span_rowids:
+        return []
+    # Every inserted span contributes its own values to each of its ancestors,
+    # and every pre-existing span whose parent has just been inserted
+    # contributes its cumulative values, i.e. those of its whole subtree, to
+    # each of its new ancestors.
+    contributions = union_all(
+        select(
+            models.Span.parent_id,
+            models.Span.cumulative_error_count,
+            models.Span.cumulative_llm_token_count_prompt,
+            models.Span.cumulative_llm_token_count_completion,
+        ).where(models.Span.id.in_(span_rowids.values())),
+        select(
+            models.Span.parent_id,
+            models.Span.cumulative_error_count,
+            models.Span.cumulative_llm_token_count_prompt,
+            models.Span.cumulative_llm_token_count_completion,
+        ).where(
+            models.Span.parent_id.in_(span_rowids.keys()),
+            models.Span.id.not_in(span_rowids.values()),
+        ),
+    ).subquery()
     ancestors = (
-        select(models.Span.id, models.Span.parent_id)
-        .where(models.Span.span_id == span.parent_id)
+        select(
+            models.Span.id,
+            models.Span.parent_id,
+            contributions.c.cumulative_error_count,
+            contributions.c.cumulative_llm_token_count_prompt,
+            contributions.c.cumulative_llm_token_count_completion,
+        )
+        .join(contributions, models.Span.span_id == contributions.c.parent_id)
         .cte(recursive=True)
     )
     child = ancestors.alias()
     ancestors = ancestors.union_all(
-        select(models.Span.id, models.Span.parent_id).join(
-            child, models.Span.span_id == child.c.parent_id
+        select(
+            models.Span.id,
+            models.Span.parent_id,
+            child.c.cumulative_error_count,
+            child.c.cumulative_llm_token_count_prompt,
+            child.c.cumulative_llm_token_count_completion,
+        ).join(child, models.Span.span_id == child.c.parent_id)
+    )
+    totals = (
+        select(
+            ancestors.c.id,
+            func.sum(ancestors.c.cumulative_error_count).label("error_count"),
+            func.sum(ancestors.c.cumulative_llm_token_count_prompt).label("prompt"),
+            func.sum(ancestors.c.cumulative_llm_token_count_completion).label("completion"),
         )
+        .group_by(ancestors.c.id)
+        .subquery()
     )
     await session.execute(
         update(models.Span)
-        .where(models.Span.id.in_(select(ancestors.c.id)))
+        .where(models.Span.id == totals.c.id)
         .values(
-            cumulative_error_count=models.Span.cumulative_error_count + cumulative_error_count,
+            cumulative_error_count=models.Span.cumulative_error_count + totals.c.error_count,
             cumulative_llm_token_count_prompt=models.Span.cumulative_llm_token_count_prompt
-            + cumulative_llm_token_count_prompt,
+            + totals.c.prompt,
             cumulative_llm_token_count_completion=models.Span.cumulative_llm_token_count_completion
-            + cumulative_llm_token_count_completion,
+            + totals.c.completion,
         )
     )
-    return SpanInsertionEvent(project_rowid)
+    return [SpanInsertionEvent(project_rowids[unique_spans[span_id][1]]) for span_id in span_rowids]
+
+
+async def _copy_spans(session: AsyncSession, records: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Streams the span records into a temporary staging table with PostgreSQL's
+    binary COPY protocol, then moves them into the spans table in a single
+    statement, skipping duplicates. Returns the rowids of the inserted spans
+    keyed by span_id.
+    """
+    names = list(records[0])
+    connection = await session.connection()
+    dialect = connection.dialect
+    columns = [models.Span.__table__.c[name] for name in names]
+    # COPY bypasses SQLAlchemy's parameter processing, so apply the column
+    # types' bind processors (e.g. JSON serialization) to the values directly.
+    processors = [c.type.dialect_impl(dialect).bind_processor(dialect) for c in columns]
+    source = select(*columns).compile(dialect=dialect)
+    await session.execute(
+        text(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {_STAGE} "
+            f"ON COMMIT DELETE ROWS AS {source} WITH NO DATA"
+        )
+    )
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    assert driver_connection is not None
+    await driver_connection.copy_records_to_table(
+        _STAGE,
+        records=[
+            tuple(
+                record[name] if processor is None else processor(record[name])
+                for name, processor in zip(names, processors)
+            )
+            for record in records
+        ],
+        columns=names,
+    )
+    stage = table(_STAGE, *(column(name) for name in names))
+    staged = delete(stage).returning(*stage.c).cte("staged")
+    stmt = (
+        insert_postgresql(models.Span)
+        .from_select(names, select(staged))
+        .on_conflict_do_nothing(index_elements=["span_id"])
+        .returning(models.Span.span_id, models.Span.id)
+        .add_cte(staged)
+    )
+    return dict((await session.execute(stmt)).tuples().all())
+
+
+def _span_record(span: Span, trace_rowid: int) -> Dict[str, Any]:
+    llm_token_count_prompt: Optional[int] = None
+    llm_token_count_completion: Optional[int] = None
+    if isinstance(token_count := get_attribute_value(span.attributes, _LLM_TOKEN_COUNT), dict):
+        llm_token_count_prompt = token_count.get(_PROMPT)
+        llm_token_count_completion = token_count.get(_COMPLETION)
+    return dict(
+        span_id=span.context.span_id,
+        trace_rowid=trace_rowid,
+        parent_id=span.parent_id,
+        span_kind=span.span_kind.value,
+        name=span.name,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        attributes=span.attributes,
+        # Events are flat dataclasses, so a shallow copy of each instance
+        # dict suffices and avoids the deep copy done by `asdict`.
+        events=[dict(vars(event)) for event in span.events],
+        status_code=span.status_code.value,
+        status_message=span.status_message,
+        cumulative_error_count=int(span.status_code is SpanStatusCode.ERROR),
+        cumulative_llm_token_count_prompt=llm_token_count_prompt or 0,
+        cumulative_llm_token_count_completion=llm_token_count_completion or 0,
+        llm_token_count_prompt=llm_token_count_prompt,
+        llm_token_count_completion=llm_token_count_completion,
+    )
@@ -1,12 +1,14 @@
 import base64
+import struct
 from dataclasses import dataclass
-from datetime import datetime
-from enum import Enum, auto
-from typing import Any, ClassVar, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 from strawberry import UNSET
 from strawberry.relay.types import Connection, Edge, NodeType, PageInfo
-from typing_extensions import TypeAlias, assert_never
+from typing_extensions import TypeAlias
 
 ID: TypeAlias = int
 CursorSortColumnValue: TypeAlias = Union[str, int, float, datetime]
@@ -18,44 +20,70 @@ CursorString = str
 CURSOR_PREFIX = "connection:"
 
 
-class CursorSortColumnDataType(Enum):
-    STRING = auto()
-    INT = auto()
-    FLOAT = auto()
-    DATETIME = auto()
+class CursorSortColumnDataType(IntEnum):
+    # The values double as the tags identifying the data type in cursor strings.
+    STRING = 1
+    INT = 2
+    FLOAT = 3
+    DATETIME = 4
+
+
+_ROWID_AND_TAG = struct.Struct("<qB")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_TIMESTAMP = struct.Struct("<q")
+_TIMESTAMP_AND_UTC_OFFSET = struct.Struct("<qq")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_SORT_COLUMN = 0
+_DATA_TYPES = {data_type.value: data_type for data_type in CursorSortColumnDataType}
+
+
+def _encode_datetime(value: datetime) -> bytes:
+    timestamp = (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+    if (utc_offset := value.utcoffset()) is None:
+        return _TIMESTAMP.pack(timestamp)
+    return _TIMESTAMP_AND_UTC_OFFSET.pack(timestamp, utc_offset // _MICROSECOND)
+
+
+def _decode_datetime(data: bytes) -> datetime:
+    value: datetime
+    if len(data) == _TIMESTAMP.size:
+        (timestamp,) = _TIMESTAMP.unpack(data)
+        value = _EPOCH + timestamp * _MICROSECOND
+    else:
+        timestamp, utc_offset = _TIMESTAMP_AND_UTC_OFFSET.unpack(data)
+        value = (_EPOCH + timestamp * _MICROSECOND).replace(
+            tzinfo=timezone(utc_offset * _MICROSECOND)
+        )
+    return value
+
 
+_ENCODERS: Dict[CursorSortColumnDataType, Callable[[Any], bytes]] = {
+    CursorSortColumnDataType.STRING: str.encode,
+    CursorSortColumnDataType.INT: _INT.pack,
+    CursorSortColumnDataType.FLOAT: _FLOAT.pack,
+    CursorSortColumnDataType.DATETIME: _encode_datetime,
+}
+_DECODERS: Dict[CursorSortColumnDataType, Callable[[bytes], CursorSortColumnValue]] = {
+    CursorSortColumnDataType.STRING: bytes.decode,
+    CursorSortColumnDataType.INT: lambda data: _INT.unpack(data)[0],
+    CursorSortColumnDataType.FLOAT: lambda data: _FLOAT.unpack(data)[0],
+    CursorSortColumnDataType.DATETIME: _decode_datetime,
+}
 
-@dataclass
+
+@dataclass(frozen=True)
 class CursorSortColumn:
     type: CursorSortColumnDataType
     value: CursorSortColumnValue
 
-    def __str__(self) -> str:
-        if isinstance(self.value, str):
-            return self.value
-        if isinstance(self.value, (int, float)):
-            return str(self.value)
-        if isinstance(self.value, datetime):
-            return self.value.isoformat()
-        assert_never(self.type)
-
     @classmethod
-    def from_string(cls, type: CursorSortColumnDataType, cursor_string: str) -> "CursorSortColumn":
-        value: CursorSortColumnValue
-        if type is CursorSortColumnDataType.STRING:
-            value = cursor_string
-        elif type is CursorSortColumnDataType.INT:
-            value = int(cursor_string)
-        elif type is CursorSortColumnDataType.FLOAT:
-            value = float(cursor_string)
-        elif type is CursorSortColumnDataType.DATETIME:
-            value = datetime.fromisoformat(cursor_string)
-        else:
-            assert_never(type)
-        return cls(type=type, value=value)
-
-
-@dataclass
+    def from_bytes(cls, type: CursorSortColumnDataType, data: bytes) -> "CursorSortColumn":
+        return cls(type=type, value=_DECODERS[type](data))
+
+
+@dataclass(frozen=True)
 class Cursor:
     """
     Serializes and deserializes cursor strings for ID-based pagination.
@@ -67,11 +95,21 @@ class Cursor:
     the client and discourages the client from making use of the encoded
     content.
 
+    The cursor is a URL-safe base64 encoding of a compact binary payload: the
+    rowid as a little-endian 64-bit integer, followed by a one-byte tag for the
+    data type of the sort column (zero if there is none), followed by the
+    value of the sort column:
+
+        STRING: the UTF-8 encoded string
+        INT: a 64-bit integer
+        FLOAT: a 64-bit float
+        DATETIME: microseconds since the epoch of the wall-clock time as a
+            64-bit integer, followed, for timezone-aware values only, by the
+            UTC offset in microseconds as a 64-bit integer
+
     Examples:
-        # encodes "10"
         Cursor(rowid=10)
 
-        # encodes "11:STRING:abc"
         Cursor(
             rowid=11,
             sort_column=CursorSortColumn(
@@ -80,25 +118,6 @@ class Cursor:
             )
         )
 
-        # encodes "10:INT:5"
-        Cursor(
-            rowid=10,
-            sort_column=CursorSortColumn(
-                type=CursorSortColumnDataType.INT,
-                value=5
-            )
-        )
-
-        # encodes "17:FLOAT:5.7"
-        Cursor(
-            rowid=17,
-            sort_column=CursorSortColumn(
-                type=CursorSortColumnDataType.FLOAT,
-                value=5.7
-            )
-        )
-
-        # encodes "20:DATETIME:2024-05-05T04:25:29.911245+00:00"
         Cursor(
             rowid=20,
             sort_column=CursorSortColumn(
@@ -111,29 +130,42 @@ class Cursor:
     rowid: int
     sort_column: Optional[CursorSortColumn] = None
 
-    _DELIMITER: ClassVar[str] = ":"
-
     def __str__(self) -> str:
-        cursor_parts = [str(self.rowid)]
-        if (sort_column := self.sort_column) is not None:
-            cursor_parts.extend([sort_column.type.name, str(sort_column)])
-        return base64.b64encode(self._DELIMITER.join(cursor_parts).encode()).decode()
+        if (sort_column := self.sort_column) is None:
+            return _encode_cursor(self.rowid, None, None, None)
+        type, value = sort_column.type, sort_column.value
+        utc_offset = None
+        if type is CursorSortColumnDataType.DATETIME:
+            utc_offset = cast(datetime, value).utcoffset()
+        return _encode_cursor(self.rowid, type, value, utc_offset)
 
     @classmethod
     def from_string(cls, cursor: str) -> "Cursor":
-        decoded = base64.b64decode(cursor).decode()
-        rowid_string = decoded
+        data = base64.urlsafe_b64decode(cursor)
+        rowid, tag = _ROWID_AND_TAG.unpack_from(data)
         sort_column = None
-        if (first_delimiter_index := decoded.find(cls._DELIMITER)) > -1:
-            rowid_string = decoded[:first_delimiter_index]
-            second_delimiter_index = decoded.index(cls._DELIMITER, first_delimiter_index + 1)
-            sort_column = CursorSortColumn.from_string(
-                type=CursorSortColumnDataType[
-                    decoded[first_delimiter_index + 1 : second_delimiter_index]
-                ],
-                cursor_string=decoded[second_delimiter_index + 1 :],
+        if tag != _NO_SORT_COLUMN:
+            sort_column = CursorSortColumn.from_bytes(
+                type=_DATA_TYPES[tag],
+                data=data[_ROWID_AND_TAG.size :],
             )
-        return cls(rowid=int(rowid_string), sort_column=sort_column)
+        return cls(rowid=rowid, sort_column=sort_column)
+
+
+@lru_cache(maxsize=4096)
+def _encode_cursor(
+    rowid: int,
+    type: Optional[CursorSortColumnDataType],
+    value: Optional[CursorSortColumnValue],
+    utc_offset: Optional[timedelta],
+) -> CursorString:
+    # The UTC offset is only part of the cache key, because timezone-aware
+    # datetimes denoting the same instant compare equal whatever their offsets.
+    if type is None:
+        data = _ROWID_AND_TAG.pack(rowid, _NO_SORT_COLUMN)
+    else:
+        data = _ROWID_AND_TAG.pack(rowid, type) + _ENCODERS[type](value)
+    return base64.urlsafe_b64encode(data).decode()
 
 
 def offset_to_cursor(offset: int) -> CursorString:
@@ -228,12 +260,10 @@ def connection_from_list_slice(
             raise Exception('Argument "last" must be a non-negative int')
         start_offset = max(start_offset, end_offset - args.last)
 
-    # If supplied slice is too large, trim it down before mapping over it.
-    slice = list_slice[start_offset - slice_start : end_offset - slice_start]
-
+    # If supplied slice is too large, only map over the part of it in range.
     edges = [
-        Edge(node=node, cursor=offset_to_cursor(start_offset + index))
-        for index, node in enumerate(slice)
+        Edge(node=list_slice[offset - slice_start], cursor=offset_to_cursor(offset))
+        for offset in range(start_offset, end_offset)
     ]
 
     has_edges = len(edges) > 0
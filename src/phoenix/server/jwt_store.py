@@ -1,14 +1,14 @@
 import logging
 from abc import ABC, abstractmethod
 from asyncio import create_task, gather, sleep
-from copy import deepcopy
 from dataclasses import replace
 from datetime import datetime, timezone
 from functools import cached_property, singledispatchmethod
-from typing import Any, Callable, Coroutine, Dict, Generic, List, Optional, Tuple, Type, TypeVar
+from typing import Any, Callable, Dict, Generic, List, Optional, Set, Tuple, Type, TypeVar
 
 from authlib.jose import jwt
 from authlib.jose.errors import JoseError
+from cachetools import LRUCache
 from sqlalchemy import Select, delete, select
 
 from phoenix.auth import (
@@ -19,6 +19,7 @@ from phoenix.auth import (
 from phoenix.config import get_env_enable_prometheus
 from phoenix.db import models
 from phoenix.db.enums import UserRole
+from phoenix.db.helpers import SupportedSQLDialect
 from phoenix.server.types import (
     AccessToken,
     AccessTokenAttributes,
@@ -40,6 +41,7 @@ from phoenix.server.types import (
     RefreshTokenId,
     TokenId,
     UserId,
+    UserTokenAttributes,
 )
 
 logger = logging.getLogger(__name__)
@@ -58,15 +60,18 @@ class JwtStore:
         super().__init__(**kwargs)
         self._db = db
         self._secret = secret
+        self._token_ids: LRUCache[Token, TokenId] = LRUCache(maxsize=10_000)
         args = (db, secret, algorithm, sleep_seconds)
         self._password_reset_token_store = _PasswordResetTokenStore(*args, **kwargs)
         self._access_token_store = _AccessTokenStore(*args, **kwargs)
         self._refresh_token_store = _RefreshTokenStore(*args, **kwargs)
         self._api_key_store = _ApiKeyStore(*args, **kwargs)
-
-    @cached_property
-    def _stores(self) -> Tuple[DaemonTask, ...]:
-        return tuple(dt for dt in self.__dict__.values() if isinstance(dt, _Store))
+        self._stores: Tuple[DaemonTask, ...] = (
+            self._password_reset_token_store,
+            self._access_token_store,
+            self._refresh_token_store,
+            self._api_key_store,
+        )
 
     async def __aenter__(self) -> None:
         await gather(*(s.__aenter__() for s in self._stores))
@@ -75,6 +80,15 @@ class JwtStore:
         await gather(*(s.__aexit__(*args, **kwargs) for s in self._stores))
 
     async def read(self, token: Token) -> Optional[ClaimSet]:
+        # Signature verification is memoized by the exact token string, so a
+        # forged token can never hit the cache of a genuine one.
+        if (token_id := self._token_ids.get(token)) is None:
+            if (token_id := self._verify(token)) is None:
+                return None
+            self._token_ids[token] = token_id
+        return await self._get(token_id)
+
+    def _verify(self, token: Token) -> Optional[TokenId]:
         try:
             payload = jwt.decode(
                 s=token,
@@ -84,9 +98,7 @@ class JwtStore:
             return None
         if (jti := payload.get("jti")) is None:
             return None
-        if (token_id := TokenId.parse(jti)) is None:
-            return None
-        return await self._get(token_id)
+        return TokenId.parse(jti)
 
     @singledispatchmethod
     async def _get(self, _: TokenId) -> Optional[ClaimSet]:
@@ -155,29 +167,23 @@ class JwtStore:
     async def revoke(self, *token_ids: TokenId) -> None:
         if not token_ids:
             return
-        password_reset_token_ids: List[PasswordResetTokenId] = []
-        access_token_ids: List[AccessTokenId] = []
-        refresh_token_ids: List[RefreshTokenId] = []
-        api_key_ids: List[ApiKeyId] = []
+        ids_by_table: Dict[Any, List[int]] = {}
         for token_id in token_ids:
-            if isinstance(token_id, PasswordResetTokenId):
-                password_reset_token_ids.append(token_id)
-            if isinstance(token_id, AccessTokenId):
-                access_token_ids.append(token_id)
-            elif isinstance(token_id, RefreshTokenId):
-                refresh_token_ids.append(token_id)
-            elif isinstance(token_id, ApiKeyId):
-                api_key_ids.append(token_id)
-        coroutines: List[Coroutine[None, None, None]] = []
-        if password_reset_token_ids:
-            coroutines.append(self._password_reset_token_store.revoke(*password_reset_token_ids))
-        if access_token_ids:
-            coroutines.append(self._access_token_store.revoke(*access_token_ids))
-        if refresh_token_ids:
-            coroutines.append(self._refresh_token_store.revoke(*refresh_token_ids))
-        if api_key_ids:
-            coroutines.append(self._api_key_store.revoke(*api_key_ids))
-        await gather(*coroutines)
+            await self._evict(token_id)
+            ids_by_table.setdefault(token_id.table, []).append(int(token_id))
+        stmts = [delete(table).where(table.id.in_(ids)) for table, ids in ids_by_table.items()]
+        async with self._db() as session:
+            if self._db.dialect is SupportedSQLDialect.POSTGRESQL:
+                # Chain the deletions as data-modifying CTEs in one statement.
+                *others, stmt = stmts
+                ctes = [
+                    other.returning(other.table.c.id).cte(f"revoked_{i}")
+                    for i, other in enumerate(others)
+                ]
+                await session.execute(stmt.add_cte(*ctes))
+            else:
+                for stmt in stmts:
+                    await session.execute(stmt)
 
     async def log_out(self, user_id: UserId) -> None:
         for cls in (AccessTokenId, RefreshTokenId):
@@ -201,25 +207,27 @@ _RecordT = TypeVar(
 
 
 class _Claims(Generic[_TokenIdT, _ClaimSetT]):
+    """
+    Claim sets and their attributes are frozen dataclasses, so they are
+    stored and returned by reference without defensive copying.
+    """
+
     def __init__(self) -> None:
         self._cache: Dict[_TokenIdT, _ClaimSetT] = {}
 
     def __getitem__(self, token_id: _TokenIdT) -> Optional[_ClaimSetT]:
-        claim = self._cache.get(token_id)
-        return deepcopy(claim) if claim else None
+        return self._cache.get(token_id)
 
     def __setitem__(self, token_id: _TokenIdT, claim: _ClaimSetT) -> None:
-        self._cache[token_id] = deepcopy(claim)
+        self._cache[token_id] = claim
 
     def get(self, token_id: _TokenIdT) -> Optional[_ClaimSetT]:
-        claim = self._cache.get(token_id)
-        return deepcopy(claim) if claim else None
+        return self._cache.get(token_id)
 
     def pop(
         self, token_id: _TokenIdT, default: Optional[_ClaimSetT] = None
     ) -> Optional[_ClaimSetT]:
-        claim = self._cache.pop(token_id, default)
-        return deepcopy(claim) if claim else None
+        return self._cache.pop(token_id, default)
 
 
 class _Store(DaemonTask, Generic[_ClaimSetT, _TokenT, _TokenIdT, _RecordT], ABC):
@@ -240,6 +248,8 @@ class _Store(DaemonTask, Generic[_ClaimSetT, _TokenT, _TokenIdT, _RecordT], ABC)
         self._db = db
         self._seconds = sleep_seconds
         self._claims: _Claims[_TokenIdT, _ClaimSetT] = _Claims()
+        self._refreshed = False
+        self._evicted: Set[_TokenIdT] = set()
         self._secret = secret
         self._algorithm = algorithm
 
@@ -255,7 +265,7 @@ class _Store(DaemonTask, Generic[_ClaimSetT, _TokenT, _TokenIdT, _RecordT], ABC)
         stmt = self._update_stmt.where(self._table.id == int(token_id))
         async with self._db() as session:
             record = (await session.execute(stmt)).first()
-        if not record:
+        if not record or token_id in self._evicted:
             return None
         token, role = record
         _, claims = self._from_db(token, UserRole(role))
@@ -263,17 +273,12 @@ class _Store(DaemonTask, Generic[_ClaimSetT, _TokenT, _TokenIdT, _RecordT], ABC)
         return claims
 
     async def evict(self, token_id: _TokenIdT) -> Optional[_ClaimSetT]:
+        # The token is about to be deleted, but a refresh that has already read
+        # it from the database must not cache it again, so remember the eviction
+        # until a refresh no longer finds the token.
+        self._evicted.add(token_id)
         return self._claims.pop(token_id, None)
 
-    async def revoke(self, *token_ids: _TokenIdT) -> None:
-        if not token_ids:
-            return
-        for token_id in token_ids:
-            await self.evict(token_id)
-        stmt = delete(self._table).where(self._table.id.in_(map(int, token_ids)))
-        async with self._db() as session:
-            await session.execute(stmt)
-
     @abstractmethod
     def _from_db(self, record: _RecordT, role: UserRole) -> Tuple[_TokenIdT, _ClaimSetT]: ...
 
@@ -292,15 +297,53 @@ class _Store(DaemonTask, Generic[_ClaimSetT, _TokenT, _TokenIdT, _RecordT], ABC)
         return token, token_id
 
     async def _update(self) -> None:
-        claims: _Claims[_TokenIdT, _ClaimSetT] = _Claims()
+        # The deletion and the refresh use separate sessions so that they can
+        # run concurrently. Claims of tokens that expire in the meantime are
+        # evicted on the next update, and expired claims are never valid anyway.
+        await gather(self._delete_expired_tokens(), self._refresh_claims())
+
+    async def _refresh_claims(self) -> None:
         async with self._db() as session:
-            async with session.begin_nested():
-                await self._delete_expired_tokens(session)
-            async with session.begin_nested():
-                async for record, role in await session.stream(self._update_stmt):
-                    token_id, claim_set = self._from_db(record, UserRole(role))
-                    claims[token_id] = claim_set
+            if self._refreshed:
+                await self._refresh(session)
+                return
+            claims: _Claims[_TokenIdT, _ClaimSetT] = _Claims()
+            async for record, role in await session.stream(self._update_stmt):
+                token_id, claim_set = self._from_db(record, UserRole(role))
+                claims[token_id] = claim_set
+        for token_id in self._evicted:
+            claims.pop(token_id)
         self._claims = claims
+        self._refreshed = True
+
+    async def _refresh(self, session: Any) -> None:
+        """
+        Incrementally refreshes the cached claims. Token records are never
+        modified after creation, so only the user roles need to be compared,
+        and full records are loaded only for tokens that are new or whose
+        user's role has changed. Cached tokens that no longer exist are evicted.
+        """
+        evicted = set(self._evicted)
+        roles: Dict[_TokenIdT, UserRole] = {}
+        async for id_, role in await session.stream(self._role_stmt):
+            roles[self._token_id(id_)] = UserRole(role)
+        self._evicted -= evicted - roles.keys()
+        cache = self._claims._cache
+        for token_id in [token_id for token_id in cache if token_id not in roles]:
+            self._claims.pop(token_id)
+        stale = [
+            int(token_id)
+            for token_id, role in roles.items()
+            if token_id not in self._evicted
+            and ((claim := cache.get(token_id)) is None or _user_role(claim) is not role)
+        ]
+        if not stale:
+            return
+        stmt = self._update_stmt.where(self._table.id.in_(stale))
+        async for record, role in await session.stream(stmt):
+            token_id, claim_set = self._from_db(record, UserRole(role))
+            if token_id not in self._evicted:
+                self._claims[token_id] = claim_set
 
     @cached_property
     def _update_stmt(self) -> Select[Tuple[_RecordT, str]]:
@@ -310,9 +353,28 @@ class _Store(DaemonTask, Generic[_ClaimSetT, _TokenT, _TokenIdT, _RecordT], ABC)
             .join_from(models.User, models.UserRole)
         )
 
-    async def _delete_expired_tokens(self, session: Any) -> None:
+    @cached_property
+    def _role_stmt(self) -> Select[Tuple[int, str]]:
+        return (
+            select(self._table.id, models.UserRole.name)
+            .join_from(self._table, models.User)
+            .join_from(models.User, models.UserRole)
+        )
+
+    async def _delete_expired_tokens(self) -> None:
         now = datetime.now(timezone.utc)
-        await session.execute(delete(self._table).where(self._table.expires_at < now))
+        if self._refreshed and not self._has_expired_claims(now):
+            # Once refreshed, the cache mirrors the table, so there is nothing to delete.
+            return
+        async with self._db() as session:
+            await session.execute(delete(self._table).where(self._table.expires_at < now))
+
+    def _has_expired_claims(self, now: datetime) -> bool:
+        timestamp = now.timestamp()
+        return any(
+            claim.expiration_time and claim.expiration_time.timestamp() < timestamp
+            for claim in self._claims._cache.values()
+        )
 
     async def _run(self) -> None:
         while self._running:
@@ -324,6 +386,12 @@ class _Store(DaemonTask, Generic[_ClaimSetT, _TokenT, _TokenIdT, _RecordT], ABC)
             self._tasks.pop()
 
 
+def _user_role(claim: ClaimSet) -> Optional[UserRole]:
+    if isinstance(attributes := claim.attributes, UserTokenAttributes):
+        return attributes.user_role
+    return None
+
+
 class _PasswordResetTokenStore(
     _Store[
         PasswordResetTokenClaims,
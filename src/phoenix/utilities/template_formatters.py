@@ -1,12 +1,13 @@
 import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from string import Formatter
-from typing import Any, Iterable, Set
+from typing import Any, FrozenSet, Iterable
 
 
 class TemplateFormatter(ABC):
     @abstractmethod
-    def parse(self, template: str) -> Set[str]:
+    def parse(self, template: str) -> FrozenSet[str]:
         """
         Parse the template and return a set of variable names.
         """
@@ -37,8 +38,8 @@ class FStringTemplateFormatter(TemplateFormatter):
     'world'
     """
 
-    def parse(self, template: str) -> Set[str]:
-        return set(field_name for _, field_name, _, _ in Formatter().parse(template) if field_name)
+    def parse(self, template: str) -> FrozenSet[str]:
+        return _parse_fstring(template)
 
     def _format(self, template: str, variable_names: Iterable[str], **variables: Any) -> str:
         return template.format(**variables)
@@ -57,14 +58,20 @@ class MustacheTemplateFormatter(TemplateFormatter):
 
     PATTERN = re.compile(r"(?<!\\){{\s*(\w+)\s*}}")
 
-    def parse(self, template: str) -> Set[str]:
-        return set(match for match in re.findall(self.PATTERN, template))
+    def parse(self, template: str) -> FrozenSet[str]:
+        return _parse_mustache(template)
 
     def _format(self, template: str, variable_names: Iterable[str], **variables: Any) -> str:
-        for variable_name in variable_names:
-            template = re.sub(
-                pattern=rf"(?<!\\){{{{\s*{variable_name}\s*}}}}",
-                repl=variables[variable_name],
-                string=template,
-            )
-        return template
+        return self.PATTERN.sub(lambda match: str(variables[match.group(1)]), template)
+
+
+@lru_cache(maxsize=1024)
+def _parse_fstring(template: str) -> FrozenSet[str]:
+    return frozenset(
+        field_name for _, field_name, _, _ in Formatter().parse(template) if field_name
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_mustache(template: str) -> FrozenSet[str]:
+    return frozenset(MustacheTemplateFormatter.PATTERN.findall(template))
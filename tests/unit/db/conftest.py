@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import pytest
+from openinference.semconv.trace import SpanAttributes
+
+from phoenix.trace.attributes import unflatten
+from phoenix.trace.schemas import Span, SpanContext, SpanEvent, SpanKind, SpanStatusCode
+
+
+@pytest.fixture
+def make_span() -> Callable[..., Span]:
+    return _make_span
+
+
+def _make_span(
+    span_id: str,
+    parent_id: Optional[str],
+    status_code: SpanStatusCode = SpanStatusCode.OK,
+    prompt: Optional[int] = None,
+    completion: Optional[int] = None,
+    events: Sequence[SpanEvent] = (),
+    trace_id: str = "xyz",
+    start_time: datetime = datetime.fromisoformat("2021-01-01T00:00:00+00:00"),
+    duration: timedelta = timedelta(seconds=1),
+    attributes: Optional[Dict[str, Any]] = None,
+) -> Span:
+    flattened_attributes: Dict[str, Any] = dict(attributes or {})
+    if prompt is not None:
+        flattened_attributes[SpanAttributes.LLM_TOKEN_COUNT_PROMPT] = prompt
+    if completion is not None:
+        flattened_attributes[SpanAttributes.LLM_TOKEN_COUNT_COMPLETION] = completion
+    return Span(
+        name=span_id,
+        context=SpanContext(trace_id=trace_id, span_id=span_id),
+        span_kind=SpanKind.LLM,
+        parent_id=parent_id,
+        start_time=start_time,
+        end_time=start_time + duration,
+        status_code=status_code,
+        status_message="",
+        attributes=unflatten(flattened_attributes.items()),
+        events=list(events),
+        conversation=None,
+    )
@@ -0,0 +1,226 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+import pytest
+from openinference.semconv.trace import SpanAttributes
+from sqlalchemy import select
+
+from phoenix.db import models
+from phoenix.db.insertion.span import (
+    _COMPLETION,
+    _LLM_TOKEN_COUNT,
+    _PROMPT,
+    insert_span,
+    insert_spans,
+)
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span, SpanEvent, SpanException, SpanStatusCode
+
+
+def test_llm_token_counts_are_read_from_a_shared_prefix() -> None:
+    assert SpanAttributes.LLM_TOKEN_COUNT_PROMPT == f"{_LLM_TOKEN_COUNT}.{_PROMPT}"
+    assert SpanAttributes.LLM_TOKEN_COUNT_COMPLETION == f"{_LLM_TOKEN_COUNT}.{_COMPLETION}"
+
+
+async def test_insert_span_propagates_cumulative_values_to_ancestors(
+    db: DbSessionFactory,
+    make_span: Callable[..., Span],
+) -> None:
+    # The child arrives before its ancestors, and the grandparent arrives
+    # before the parent, so each insertion exercises a different propagation path.
+    async with db() as session:
+        assert await insert_span(
+            session,
+            make_span("child", "parent", status_code=SpanStatusCode.ERROR, prompt=1, completion=2),
+            "abc",
+        )
+    async with db() as session:
+        assert await insert_span(session, make_span("grandparent", None, prompt=10), "abc")
+    async with db() as session:
+        assert await insert_span(session, make_span("parent", "grandparent", completion=20), "abc")
+    async with db() as session:
+        assert await insert_span(
+            session,
+            make_span("sibling", "parent", status_code=SpanStatusCode.ERROR, prompt=100),
+            "abc",
+        )
+    async with db() as session:
+        # Duplicate spans are ignored and do not propagate anything.
+        assert (
+            await insert_span(session, make_span("sibling", "parent", prompt=1000), "abc") is None
+        )
+    async with db() as session:
+        spans = {span.span_id: span for span in await session.scalars(select(models.Span))}
+        traces = list(await session.scalars(select(models.Trace)))
+        projects = list(await session.scalars(select(models.Project)))
+    assert len(projects) == 1
+    assert len(traces) == 1
+    assert {span.trace_rowid for span in spans.values()} == {traces[0].id}
+    assert _cumulative(spans["child"]) == (1, 1, 2)
+    assert _cumulative(spans["sibling"]) == (1, 100, 0)
+    assert _cumulative(spans["parent"]) == (2, 101, 22)
+    assert _cumulative(spans["grandparent"]) == (2, 111, 22)
+    assert spans["child"].llm_token_count_prompt == 1
+    assert spans["grandparent"].llm_token_count_completion is None
+
+
+async def test_insert_span_extends_the_time_range_of_an_existing_trace(
+    db: DbSessionFactory,
+    make_span: Callable[..., Span],
+) -> None:
+    start_time = datetime.fromisoformat("2021-01-01T00:00:00+00:00")
+    async with db() as session:
+        assert await insert_span(
+            session, make_span("child", "parent", start_time=start_time), "abc"
+        )
+    async with db() as session:
+        assert await insert_span(
+            session,
+            make_span(
+                "parent",
+                None,
+                start_time=start_time - timedelta(seconds=1),
+                duration=timedelta(seconds=3),
+            ),
+            "abc",
+        )
+    async with db() as session:
+        trace = await session.scalar(select(models.Trace))
+    assert trace is not None
+    assert trace.start_time == start_time - timedelta(seconds=1)
+    assert trace.end_time == start_time + timedelta(seconds=2)
+
+
+async def test_insert_spans_extends_the_time_ranges_of_existing_traces(
+    db: DbSessionFactory,
+    make_span: Callable[..., Span],
+) -> None:
+    start_time = datetime.fromisoformat("2021-01-01T00:00:00+00:00")
+    async with db() as session:
+        assert await insert_spans(
+            session,
+            [
+                (make_span("a", None, trace_id="earlier", start_time=start_time), "abc"),
+                (make_span("b", None, trace_id="later", start_time=start_time), "abc"),
+                (make_span("c", None, trace_id="unchanged", start_time=start_time), "abc"),
+            ],
+        )
+    async with db() as session:
+        assert await insert_spans(
+            session,
+            [
+                (
+                    make_span("d", "a", trace_id="earlier", start_time=start_time - timedelta(1)),
+                    "abc",
+                ),
+                (
+                    make_span("e", "b", trace_id="later", duration=timedelta(seconds=5)),
+                    "abc",
+                ),
+                (make_span("f", "c", trace_id="unchanged", start_time=start_time), "abc"),
+            ],
+        )
+    async with db() as session:
+        traces = {
+            trace.trace_id: (trace.start_time, trace.end_time)
+            for trace in await session.scalars(select(models.Trace))
+        }
+    assert traces == {
+        "earlier": (start_time - timedelta(1), start_time + timedelta(seconds=1)),
+        "later": (start_time, start_time + timedelta(seconds=5)),
+        "unchanged": (start_time, start_time + timedelta(seconds=1)),
+    }
+
+
+async def test_insert_span_stores_events(
+    db: DbSessionFactory,
+    make_span: Callable[..., Span],
+) -> None:
+    timestamp = datetime.fromisoformat("2021-01-01T00:00:00.5+00:00")
+    events = [
+        SpanEvent(name="first", timestamp=timestamp, attributes={"a": {"b": [1, 2]}}),
+        SpanException(timestamp=timestamp, message="boom", exception_type="ValueError"),
+    ]
+    async with db() as session:
+        assert await insert_span(session, make_span("span", None, events=events), "abc")
+    async with db() as session:
+        span = await session.scalar(select(models.Span))
+    assert span is not None
+    assert span.events == [
+        {"name": "first", "timestamp": timestamp.isoformat(), "attributes": {"a": {"b": [1, 2]}}},
+        {
+            "name": "exception",
+            "timestamp": timestamp.isoformat(),
+            "attributes": {"exception.type": "ValueError", "exception.message": "boom"},
+        },
+    ]
+
+
+@pytest.mark.parametrize("copy_threshold", [0, None], ids=["copy", "insert"])
+async def test_insert_spans_matches_inserting_spans_one_at_a_time(
+    db: DbSessionFactory,
+    copy_threshold: Optional[int],
+    monkeypatch: pytest.MonkeyPatch,
+    make_span: Callable[..., Span],
+) -> None:
+    if copy_threshold is not None:
+        monkeypatch.setattr("phoenix.db.insertion.span._COPY_THRESHOLD", copy_threshold)
+    async with db() as session:
+        assert await insert_span(
+            session,
+            make_span("child", "parent", status_code=SpanStatusCode.ERROR, prompt=1, completion=2),
+            "abc",
+        )
+    async with db() as session:
+        assert await insert_span(session, make_span("grandparent", None, prompt=10), "abc")
+    async with db() as session:
+        assert await insert_spans(session, []) == []
+    async with db() as session:
+        events = await insert_spans(
+            session,
+            [
+                (make_span("parent", "grandparent", completion=20), "abc"),
+                (
+                    make_span(
+                        "grandchild", "sibling", status_code=SpanStatusCode.ERROR, completion=3
+                    ),
+                    "abc",
+                ),
+                (
+                    make_span("sibling", "parent", status_code=SpanStatusCode.ERROR, prompt=100),
+                    "abc",
+                ),
+                # Duplicates, whether already stored or earlier in the batch, are ignored.
+                (make_span("child", "parent", prompt=1000), "abc"),
+                (make_span("sibling", "parent", prompt=1000), "abc"),
+                (make_span("other", None, prompt=5, trace_id="uvw"), "def"),
+            ],
+        )
+    async with db() as session:
+        spans = {span.span_id: span for span in await session.scalars(select(models.Span))}
+        traces = {trace.trace_id: trace for trace in await session.scalars(select(models.Trace))}
+        projects = {
+            project.name: project for project in await session.scalars(select(models.Project))
+        }
+    assert sorted(event.project_rowid for event in events) == sorted(
+        [projects["abc"].id] * 3 + [projects["def"].id]
+    )
+    assert {name: trace.project_rowid for name, trace in traces.items()} == {
+        "xyz": projects["abc"].id,
+        "uvw": projects["def"].id,
+    }
+    assert _cumulative(spans["child"]) == (1, 1, 2)
+    assert _cumulative(spans["grandchild"]) == (1, 0, 3)
+    assert _cumulative(spans["sibling"]) == (2, 100, 3)
+    assert _cumulative(spans["parent"]) == (3, 101, 25)
+    assert _cumulative(spans["grandparent"]) == (3, 111, 25)
+    assert _cumulative(spans["other"]) == (0, 5, 0)
+    assert spans["sibling"].llm_token_count_prompt == 100
+
+
+def _cumulative(span: models.Span) -> Any:
+    return (
+        span.cumulative_error_count,
+        span.cumulative_llm_token_count_prompt,
+        span.cumulative_llm_token_count_completion,
+    )
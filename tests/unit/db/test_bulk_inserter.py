@@ -0,0 +1,39 @@
+import logging
+from queue import SimpleQueue
+from typing import Callable
+
+import pytest
+from sqlalchemy import select
+
+from phoenix.db import models
+from phoenix.db.bulk_inserter import BulkInserter
+from phoenix.server.dml_event import DmlEvent, SpanInsertEvent
+from phoenix.server.types import DbSessionFactory
+from phoenix.trace.schemas import Span
+
+
+async def test_insert_spans_falls_back_to_one_at_a_time_when_batch_fails(
+    db: DbSessionFactory,
+    caplog: pytest.LogCaptureFixture,
+    make_span: Callable[..., Span],
+) -> None:
+    event_queue: SimpleQueue[DmlEvent] = SimpleQueue()
+    bulk_inserter = BulkInserter(db, event_queue=event_queue)
+    spans = [
+        (make_span("first", None, trace_id="abc"), "abc"),
+        # The attributes cannot be serialized to JSON, so the batch fails.
+        (make_span("bad", None, trace_id="abc", attributes={"value": object()}), "abc"),
+        (make_span("second", None, trace_id="xyz"), "def"),
+    ]
+    with caplog.at_level(logging.WARNING, logger="phoenix.db.bulk_inserter"):
+        await bulk_inserter._insert_spans(spans)
+    assert "Failed to insert spans in bulk" in caplog.text
+    assert "Failed to insert span with span_id=bad" in caplog.text
+    async with db() as session:
+        span_ids = set(await session.scalars(select(models.Span.span_id)))
+        project_ids = set(await session.scalars(select(models.Project.id)))
+    assert span_ids == {"first", "second"}
+    event = event_queue.get_nowait()
+    assert isinstance(event, SpanInsertEvent)
+    assert set(event.ids) == project_ids
+    assert event_queue.empty()
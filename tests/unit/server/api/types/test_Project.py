@@ -174,9 +174,9 @@ PROJECT_ID = str(GlobalID(type_name="Project", node_id="1"))
                 "after": str(
                     Cursor(
                         3,
-                        sort_column=CursorSortColumn.from_string(
+                        sort_column=CursorSortColumn(
                             type=CursorSortColumnDataType.DATETIME,
-                            cursor_string="2023-12-11T17:43:23.307166+00:00",
+                            value=datetime.fromisoformat("2023-12-11T17:43:23.307166+00:00"),
                         ),
                     )
                 ),
@@ -206,9 +206,9 @@ PROJECT_ID = str(GlobalID(type_name="Project", node_id="1"))
                 "after": str(
                     Cursor(
                         3,
-                        sort_column=CursorSortColumn.from_string(
+                        sort_column=CursorSortColumn(
                             type=CursorSortColumnDataType.DATETIME,
-                            cursor_string="2023-12-11T17:43:23.307166+00:00",
+                            value=datetime.fromisoformat("2023-12-11T17:43:23.307166+00:00"),
                         ),
                     )
                 ),
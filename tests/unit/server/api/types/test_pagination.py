@@ -1,5 +1,7 @@
 from datetime import datetime
+from typing import List
 
+import pytest
 from strawberry.relay.types import Connection
 
 import phoenix.core.model_schema as ms
@@ -18,33 +20,22 @@ from phoenix.server.api.types.pagination import (
 from phoenix.server.api.types.Span import Span
 
 
-def test_connection_from_list() -> None:
-    dimensions = [
+@pytest.fixture(scope="module")
+def dimensions() -> List[Dimension]:
+    return [
         Dimension(
-            id_attr=0,
-            name="first",
+            id_attr=id_attr,
+            name=name,
             type=DimensionType.feature,
             dataType=DimensionDataType.categorical,
             shape=DimensionShape.discrete,
             dimension=ms.ScalarDimension(role=FEATURE),
-        ),
-        Dimension(
-            id_attr=1,
-            name="second",
-            type=DimensionType.feature,
-            dataType=DimensionDataType.categorical,
-            shape=DimensionShape.discrete,
-            dimension=ms.ScalarDimension(role=FEATURE),
-        ),
-        Dimension(
-            id_attr=2,
-            name="third",
-            type=DimensionType.feature,
-            dataType=DimensionDataType.categorical,
-            shape=DimensionShape.discrete,
-            dimension=ms.ScalarDimension(role=FEATURE),
-        ),
+        )
+        for id_attr, name in enumerate(("first", "second", "third"))
     ]
+
+
+def test_connection_from_list(dimensions: List[Dimension]) -> None:
     connection = connection_from_list(dimensions, ConnectionArgs(first=2))
 
     # Check that the connection has the correct number of edges and that it has a next page
@@ -59,33 +50,7 @@ def test_connection_from_list() -> None:
     assert next_connection.page_info.has_next_page is False
 
 
-def test_connection_from_list_reverse() -> None:
-    dimensions = [
-        Dimension(
-            id_attr=0,
-            name="first",
-            type=DimensionType.feature,
-            dataType=DimensionDataType.categorical,
-            shape=DimensionShape.discrete,
-            dimension=ms.ScalarDimension(role=FEATURE),
-        ),
-        Dimension(
-            id_attr=1,
-            name="second",
-            type=DimensionType.feature,
-            dataType=DimensionDataType.categorical,
-            shape=DimensionShape.discrete,
-            dimension=ms.ScalarDimension(role=FEATURE),
-        ),
-        Dimension(
-            id_attr=2,
-            name="third",
-            type=DimensionType.feature,
-            dataType=DimensionDataType.categorical,
-            shape=DimensionShape.discrete,
-            dimension=ms.ScalarDimension(role=FEATURE),
-        ),
-    ]
+def test_connection_from_list_reverse(dimensions: List[Dimension]) -> None:
     connection = connection_from_list(dimensions, ConnectionArgs(last=2))
 
     # Check that the connection has the correct number of edges and that it has a previous page
@@ -209,3 +174,38 @@ class TestCursor:
         assert sort_column.value == timestamp
         assert isinstance(sort_column_value := sort_column.value, datetime)
         assert sort_column_value.tzinfo is not None
+
+    def test_to_and_from_string_with_rowid_and_non_utc_datetime_deserializes_original(
+        self,
+    ) -> None:
+        timestamp = datetime.fromisoformat("1969-12-31T23:59:59.999999-05:30")
+        original = Cursor(
+            rowid=10,
+            sort_column=CursorSortColumn(type=CursorSortColumnDataType.DATETIME, value=timestamp),
+        )
+        cursor_string = str(original)
+        deserialized = Cursor.from_string(cursor_string)
+        assert deserialized.rowid == 10
+        assert (sort_column := deserialized.sort_column) is not None
+        assert sort_column.type == CursorSortColumnDataType.DATETIME
+        assert isinstance(sort_column_value := sort_column.value, datetime)
+        assert sort_column_value.isoformat() == timestamp.isoformat()
+
+    def test_to_string_distinguishes_datetimes_at_the_same_instant_with_different_offsets(
+        self,
+    ) -> None:
+        utc = datetime.fromisoformat("2024-05-05T04:25:29.911245+00:00")
+        ist = datetime.fromisoformat("2024-05-05T09:55:29.911245+05:30")
+        assert utc == ist
+        for timestamp in (utc, ist):
+            cursor_string = str(
+                Cursor(
+                    rowid=10,
+                    sort_column=CursorSortColumn(
+                        type=CursorSortColumnDataType.DATETIME, value=timestamp
+                    ),
+                )
+            )
+            assert (sort_column := Cursor.from_string(cursor_string).sort_column) is not None
+            assert isinstance(sort_column_value := sort_column.value, datetime)
+            assert sort_column_value.isoformat() == timestamp.isoformat()
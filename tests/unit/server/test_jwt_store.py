@@ -0,0 +1,104 @@
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timezone
+
+import pytest
+
+from phoenix.auth import Token
+from phoenix.db import models
+from phoenix.db.enums import UserRole
+from phoenix.server.jwt_store import JwtStore, _Claims
+from phoenix.server.types import (
+    AccessTokenAttributes,
+    AccessTokenClaims,
+    AccessTokenId,
+    ApiKeyAttributes,
+    ApiKeyClaims,
+    DbSessionFactory,
+    RefreshTokenId,
+    UserId,
+)
+
+
+def test_claims_are_returned_by_reference_and_cannot_be_mutated() -> None:
+    token_id = AccessTokenId(1)
+    claim = AccessTokenClaims(
+        token_id=token_id,
+        subject=UserId(2),
+        issued_at=datetime.now(timezone.utc),
+        attributes=AccessTokenAttributes(
+            user_role=UserRole.MEMBER,
+            refresh_token_id=RefreshTokenId(3),
+        ),
+    )
+    claims: _Claims[AccessTokenId, AccessTokenClaims] = _Claims()
+    claims[token_id] = claim
+    assert (cached := claims.get(token_id)) is claim
+    assert claims[token_id] is claim
+    with pytest.raises(FrozenInstanceError):
+        cached.subject = UserId(4)  # type: ignore[misc]
+    assert cached.attributes is not None
+    with pytest.raises(FrozenInstanceError):
+        cached.attributes.user_role = UserRole.ADMIN  # type: ignore[misc]
+    assert claims.pop(token_id) is claim
+    assert claims.get(token_id) is None
+
+
+async def test_read_does_not_accept_forged_token_after_genuine_token_is_verified(
+    db: DbSessionFactory,
+) -> None:
+    token_id = AccessTokenId(1)
+    claim = AccessTokenClaims(
+        token_id=token_id,
+        subject=UserId(2),
+        attributes=AccessTokenAttributes(
+            user_role=UserRole.MEMBER,
+            refresh_token_id=RefreshTokenId(3),
+        ),
+    )
+    store = JwtStore(db, "secret")
+    store._access_token_store._claims[token_id] = claim
+    token = Token(store._access_token_store._encode(claim))
+    assert await store.read(token) is claim
+    assert await store.read(token) is claim
+    forged = JwtStore(db, "forged")._access_token_store._encode(claim)
+    assert await store.read(Token(forged)) is None
+    assert await store.read(Token(f"{token.rsplit('.', 1)[0]}.")) is None
+
+
+async def test_refresh_does_not_restore_claims_of_token_being_revoked(
+    db: DbSessionFactory,
+) -> None:
+    async with db() as session:
+        role = models.UserRole(name=UserRole.MEMBER.value)
+        session.add(role)
+        await session.flush()
+        user = models.User(
+            user_role_id=role.id,
+            username="username",
+            email="email",
+            password_hash=b"hash",
+            password_salt=b"salt",
+            reset_password=False,
+        )
+        session.add(user)
+        await session.flush()
+    store = JwtStore(db, "secret")
+    api_key_store = store._api_key_store
+    token, token_id = await store.create_api_key(
+        ApiKeyClaims(
+            subject=UserId(user.id),
+            issued_at=datetime.now(timezone.utc),
+            attributes=ApiKeyAttributes(user_role=UserRole.MEMBER, name="name"),
+        )
+    )
+    await api_key_store._refresh_claims()
+    assert await store.read(token) is not None
+    # Simulate a refresh that reads the token before the revocation deletes it.
+    await api_key_store.evict(token_id)
+    await api_key_store._refresh_claims()
+    assert api_key_store._claims.get(token_id) is None
+    assert await store.read(token) is None
+    await store.revoke(token_id)
+    await api_key_store._refresh_claims()
+    assert token_id not in api_key_store._evicted
+    assert await store.read(token) is None
@@ -68,6 +68,13 @@ from phoenix.utilities.template_formatters import (
             "world, hello",
             id="mustache-replaced-value-is-variable-name",
         ),
+        pytest.param(
+            MustacheTemplateFormatter,
+            "{{ hello }}",
+            {"hello": r"\1 \g<0>"},
+            r"\1 \g<0>",
+            id="mustache-replaced-value-contains-backreferences",
+        ),
         pytest.param(
             FStringTemplateFormatter,
             "{hello}",